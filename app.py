@@ -9,22 +9,41 @@ Run:
     python app.py
 
 Access: http://127.0.0.1:5000/
+
+Background processing (optional):
+    pip install "celery[redis]"
+    set CELERY_BROKER_URL, then run `celery -A app.celery worker --concurrency=4`
+    Uploads are then queued and the browser polls /status/<task_id>.
 """
 
 import os
+import json
+import uuid
+import hashlib
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, request, render_template, send_from_directory, redirect, url_for, flash
+from flask import Flask, request, render_template, send_from_directory, redirect, url_for, flash, abort
 from werkzeug.utils import secure_filename
 
+from extensions import celery
+
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import FileTarget, ValueTarget
+except ImportError:
+    StreamingFormDataParser = None
+
 # Import analysis functions
 try:
     from forensic_analyzer_advanced import (
         ensure_output_directory,
         compute_hash,
-        analyze_abuse,
-        generate_summary,
-        save_results_csv,
+        log_file_integrity,
+        stream_analysis,
+        SENTIMENT_BACKEND,
+        KEYWORD_SETS,
+        NEGATIVE_THRESHOLD,
+        POSITIVE_THRESHOLD,
         save_forensic_report,
         visualize_sentiment,
     )
@@ -33,25 +52,36 @@ except Exception:
     from forensic_analyzer import (
         ensure_output_directory,
         compute_hash,
-        analyze_abuse,
-        generate_summary,
-        save_results_csv,
+        log_file_integrity,
+        stream_analysis,
+        SENTIMENT_BACKEND,
+        ABUSIVE_KEYWORDS,
+        NEGATIVE_THRESHOLD,
+        POSITIVE_THRESHOLD,
         save_forensic_report,
         visualize_sentiment,
     )
+    KEYWORD_SETS = {"general": ABUSIVE_KEYWORDS}
 
 # Flask app configuration
 BASE_DIR = Path(__file__).resolve().parent
 UPLOAD_FOLDER = BASE_DIR / "uploads"
 RESULTS_FOLDER = BASE_DIR / "results"
 ALLOWED_EXTENSIONS = {"csv"}
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Summary pages of past analyses, keyed by input hash; least recently used
+# entries beyond CACHE_MAX_ENTRIES are dropped
+CACHE_DIR = RESULTS_FOLDER / "_cache"
+CACHE_MAX_ENTRIES = 256
 
 app = Flask(__name__)
 app.config["UPLOAD_FOLDER"] = str(UPLOAD_FOLDER)
 app.secret_key = "replace-with-a-secure-key"
 
-# Ensure folders exist
+# Ensure folders exist (once, at startup - not per request)
 UPLOAD_FOLDER.mkdir(exist_ok=True)
+RESULTS_FOLDER.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 ensure_output_directory()
 
 
@@ -59,13 +89,170 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def receive_upload(upload_path):
+    """
+    Parse the multipart form, writing any uploaded file to `upload_path`.
+
+    With streaming-form-data installed the request body is read in
+    UPLOAD_CHUNK_SIZE pieces and the file part goes straight to disk,
+    skipping Werkzeug's spooled temporary file and the copy on save.
+
+    Returns (use_sample, keyword_preset, filename); filename is the
+    client-supplied name, or "" when no file was sent.
+    """
+    if StreamingFormDataParser is None or request.mimetype != "multipart/form-data":
+        file = request.files.get("file")
+        filename = file.filename if file else ""
+        if filename:
+            file.save(str(upload_path))
+        return request.form.get("use_sample") == "on", request.form.get("keyword_preset", "general"), filename
+
+    parser = StreamingFormDataParser(headers=request.headers)
+    file_target = FileTarget(str(upload_path))
+    use_sample_target = ValueTarget()
+    keyword_preset_target = ValueTarget()
+    parser.register("file", file_target)
+    parser.register("use_sample", use_sample_target)
+    parser.register("keyword_preset", keyword_preset_target)
+
+    while True:
+        chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.data_received(chunk)
+
+    use_sample = use_sample_target.value.decode("utf-8") == "on"
+    keyword_preset = keyword_preset_target.value.decode("utf-8") or "general"
+    return use_sample, keyword_preset, file_target.multipart_filename or ""
+
+
+def _settings_digest(keyword_preset):
+    """Short digest of the keywords and thresholds an analysis depends on."""
+    settings = (sorted(KEYWORD_SETS[keyword_preset]), NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD)
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()[:12]
+
+
+def _cache_path(file_hash, keyword_preset):
+    # keyword_preset must be a KEYWORD_SETS key (see run_analysis_pipeline)
+    digest = _settings_digest(keyword_preset)
+    return CACHE_DIR / f"{file_hash}_{keyword_preset}_{SENTIMENT_BACKEND}_{digest}.json"
+
+
+def load_cached_outputs(file_hash, keyword_preset):
+    """
+    Return the stored `results.html` arguments for an identical earlier
+    analysis, or None if there is none or its output files are gone.
+    """
+    cache_file = _cache_path(file_hash, keyword_preset)
+    try:
+        outputs = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    output_names = (outputs["csv_file"], outputs["report_file"], outputs["viz_file"])
+    if not all((RESULTS_FOLDER / name).exists() for name in output_names):
+        return None
+
+    os.utime(cache_file)  # mark as recently used
+    return outputs
+
+
+def store_cached_outputs(file_hash, keyword_preset, outputs):
+    """
+    Store `results.html` arguments for reuse, evicting the oldest entries.
+
+    The cache is best effort: a failed write leaves the finished analysis
+    untouched.
+    """
+    cache_file = _cache_path(file_hash, keyword_preset)
+    tmp_file = cache_file.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_file.write_text(json.dumps(outputs), encoding="utf-8")
+        tmp_file.replace(cache_file)
+
+        entries = sorted(CACHE_DIR.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in entries[CACHE_MAX_ENTRIES:]:
+            stale.unlink(missing_ok=True)
+    except OSError as e:
+        tmp_file.unlink(missing_ok=True)
+        app.logger.warning("Could not store cached results: %s", e)
+
+
+def run_analysis_pipeline(input_path, keyword_preset):
+    """
+    Run hashing, analysis and output generation for one input file.
+
+    Returns the keyword arguments for `results.html` (plain Python types so
+    they survive the Celery result backend), or None if analysis failed.
+    """
+    input_path = Path(input_path)
+    # Unknown presets are analyzed with the general keywords; key them so too
+    if keyword_preset not in KEYWORD_SETS:
+        keyword_preset = "general"
+
+    # Compute and record hash
+    file_hash = compute_hash(str(input_path)) or "N/A"
+    log_file_integrity(str(input_path), file_hash)
+
+    # Identical evidence analyzed before: reuse its outputs
+    if file_hash != "N/A":
+        cached = load_cached_outputs(file_hash, keyword_preset)
+        if cached is not None:
+            cached["input_file"] = input_path.name
+            return cached
+
+    # Save outputs with timestamped names to avoid clobber; the random suffix
+    # keeps uploads started in the same second by parallel workers apart
+    ts = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    csv_name = f"analysis_results_{ts}.csv"
+    report_name = f"forensic_report_{ts}.txt"
+    viz_name = f"sentiment_analysis_{ts}.png"
+
+    # Run analysis chunk by chunk, writing the results CSV as it goes
+    result = stream_analysis(str(input_path), str(RESULTS_FOLDER / csv_name), keyword_preset)
+    if result is None:
+        return None
+    summary, findings, sample = result
+
+    save_forensic_report(findings, summary, str(input_path), file_hash, str(RESULTS_FOLDER / report_name))
+    visualize_sentiment(sample, str(RESULTS_FOLDER / viz_name), summary)
+
+    outputs = {
+        "summary": {
+            "total_messages": int(summary["total_messages"]),
+            "abusive_count": int(summary["abusive_count"]),
+            "abusive_percentage": float(summary["abusive_percentage"]),
+            "sentiment_counts": {str(k): int(v) for k, v in summary["sentiment_counts"].items()},
+            "avg_polarity": float(summary["avg_polarity"]),
+            "avg_subjectivity": float(summary["avg_subjectivity"]),
+        },
+        "csv_file": csv_name,
+        "report_file": report_name,
+        "viz_file": viz_name,
+        "input_file": input_path.name,
+        "file_hash": file_hash,
+    }
+    if file_hash != "N/A":
+        store_cached_outputs(file_hash, keyword_preset, outputs)
+    return outputs
+
+
+if celery is not None:
+    run_analysis = celery.task(name="forensic.run_analysis")(run_analysis_pipeline)
+else:
+    run_analysis = None
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
         # Handle file upload
-        file = request.files.get("file")
-        use_sample = request.form.get("use_sample") == "on"
-        keyword_preset = request.form.get("keyword_preset", "general")
+        upload_id = uuid.uuid4().hex
+        upload_path = UPLOAD_FOLDER / f"{upload_id}.part"
+        use_sample, keyword_preset, upload_name = receive_upload(upload_path)
+
+        if use_sample or not allowed_file(upload_name):
+            upload_path.unlink(missing_ok=True)
 
         if use_sample:
             input_path = BASE_DIR / "incident_log.csv"
@@ -73,54 +260,55 @@ def index():
                 flash("Sample file not found.", "error")
                 return redirect(url_for("index"))
         else:
-            if not file or file.filename == "":
+            if not upload_name:
                 flash("No file selected.", "error")
                 return redirect(url_for("index"))
-            if not allowed_file(file.filename):
+            if not allowed_file(upload_name):
                 flash("Only CSV files are allowed.", "error")
                 return redirect(url_for("index"))
 
-            filename = secure_filename(file.filename)
-            input_path = UPLOAD_FOLDER / f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
-            file.save(str(input_path))
+            filename = secure_filename(upload_name)
+            # The upload id keeps same-named uploads from the same second apart
+            input_path = UPLOAD_FOLDER / f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{upload_id[:8]}_{filename}"
+            upload_path.replace(input_path)
 
-        # Compute hash
-        file_hash = compute_hash(str(input_path)) or "N/A"
+        # Queue the analysis when a worker is available
+        if run_analysis is not None:
+            task = run_analysis.apply_async([str(input_path), keyword_preset])
+            return redirect(url_for("status", task_id=task.id))
 
-        # Run analysis
-        df = analyze_abuse(str(input_path), keyword_preset)
-        if df is None:
+        outputs = run_analysis_pipeline(input_path, keyword_preset)
+        if outputs is None:
             flash("Analysis failed. Check server logs.", "error")
             return redirect(url_for("index"))
 
-        # Generate summary and outputs
-        summary = generate_summary(df)
-
-        # Save outputs with timestamped names to avoid clobber
-        ts = datetime.now().strftime("%Y%m%d%H%M%S")
-        csv_name = f"analysis_results_{ts}.csv"
-        report_name = f"forensic_report_{ts}.txt"
-        viz_name = f"sentiment_analysis_{ts}.png"
-
-        save_results_csv(df, str(RESULTS_FOLDER / csv_name))
-        save_forensic_report(df, summary, str(input_path), file_hash, str(RESULTS_FOLDER / report_name))
-        visualize_sentiment(df, str(RESULTS_FOLDER / viz_name))
-
         # Render results page
-        return render_template(
-            "results.html",
-            summary=summary,
-            csv_file=csv_name,
-            report_file=report_name,
-            viz_file=viz_name,
-            input_file=input_path.name,
-            file_hash=file_hash,
-        )
+        return render_template("results.html", **outputs)
 
     # GET
     return render_template("index.html")
 
 
+@app.route("/status/<task_id>")
+def status(task_id):
+    if run_analysis is None:
+        abort(404)
+
+    result = run_analysis.AsyncResult(task_id)
+    if result.state == "SUCCESS":
+        outputs = result.get()
+        if outputs is None:
+            flash("Analysis failed. Check server logs.", "error")
+            return redirect(url_for("index"))
+        return render_template("results.html", **outputs)
+    if result.state == "FAILURE":
+        flash("Analysis failed. Check worker logs.", "error")
+        return redirect(url_for("index"))
+
+    # PENDING / STARTED / RETRY: keep polling
+    return render_template("status.html", task_id=task_id, state=result.state)
+
+
 @app.route('/results/<path:filename>')
 def download_file(filename):
     return send_from_directory(str(RESULTS_FOLDER), filename, as_attachment=True)
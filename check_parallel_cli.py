@@ -0,0 +1,78 @@
+"""
+Check Script: parallel sentiment scoring from the command line
+Runs forensic_analyzer.py and forensic_analyzer_advanced.py as scripts on a
+generated CSV with more than PARALLEL_MIN_MESSAGES distinct messages, with
+two joblib workers forced, and checks that both exit cleanly.
+
+Run:
+    python check_parallel_cli.py
+
+Requires joblib. Outputs are written to a temporary directory, not results/.
+"""
+
+import csv
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+SCRIPTS = ["forensic_analyzer.py", "forensic_analyzer_advanced.py"]
+MESSAGES = 30_000  # above the default PARALLEL_MIN_MESSAGES (20,000)
+WORKERS = 2
+
+# Executed in a fresh interpreter: force WORKERS processes (even on a
+# single-core machine), then run the script as __main__ like the CLI does
+RUNNER = """
+import runpy, sys
+import joblib
+joblib.effective_n_jobs = lambda n_jobs=-1: {workers}
+sys.path.insert(0, {base_dir!r})
+sys.argv = [{script!r}, {input_file!r}]
+runpy.run_path({script!r}, run_name="__main__")
+"""
+
+
+def write_messages(path, count):
+    """Write a CSV of `count` distinct messages."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "platform", "short_text"])
+        for i in range(count):
+            text = f"message {i}: you are stupid" if i % 3 == 0 else f"message {i}: have a great day"
+            writer.writerow([i, "Twitter", text])
+
+
+def run_check():
+    try:
+        import joblib  # noqa: F401
+    except ImportError:
+        print("joblib is not installed; parallel scoring is disabled, nothing to check")
+        return True
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = str(Path(tmp) / "messages.csv")
+        write_messages(input_file, MESSAGES)
+
+        for script in SCRIPTS:
+            code = RUNNER.format(
+                workers=WORKERS,
+                base_dir=str(BASE_DIR),
+                script=str(BASE_DIR / script),
+                input_file=input_file,
+            )
+            result = subprocess.run(
+                [sys.executable, "-c", code], cwd=tmp, capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                print(f"✓ {script}: OK")
+            else:
+                ok = False
+                print(f"❌ {script}: exit code {result.returncode}")
+                print(result.stderr[-2000:])
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_check() else 1)
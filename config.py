@@ -49,6 +49,16 @@ NEGATIVE_THRESHOLD = -0.1  # Below this = Negative
 POSITIVE_THRESHOLD = 0.1   # Above this = Positive
 # Between thresholds = Neutral
 
+# Sentiment engine
+# "textblob" - TextBlob pattern analyzer (default)
+# "vader"    - VADER lexicon scorer, much faster on short social-media text
+#              (requires: pip install vaderSentiment)
+#              Polarity = compound score, subjectivity = non-neutral share
+SENTIMENT_BACKEND = "textblob"
+# Distinct texts whose sentiment scores are memoized (per process), so
+# messages repeated across chunks or uploads are scored only once
+SENTIMENT_CACHE_SIZE = 200_000
+
 # ============================================================================
 # OUTPUT CONFIGURATION
 # ============================================================================
@@ -63,8 +73,10 @@ HASHES_LOG = f"{OUTPUT_DIR}/integrity_hashes.txt"
 # VISUALIZATION CONFIGURATION
 # ============================================================================
 
-VISUALIZATION_DPI = 300
-VISUALIZATION_SIZE = (14, 10)
+# Resolution of the saved chart (the figure is laid out at 100 DPI either way).
+# 100 DPI suits on-screen/web viewing; raise to 300 for print-quality charts
+VISUALIZATION_DPI = 100
+VISUALIZATION_SIZE = (10, 7)
 
 # Colors for charts
 COLOR_NEGATIVE = '#e74c3c'  # Red
@@ -80,11 +92,49 @@ COLOR_SAFE = '#2ecc71'      # Green
 # CSV reading options
 CSV_ENCODING = 'utf-8'
 CSV_REQUIRED_COLUMNS = ['short_text']
-
-# Hash algorithm
+# Columns to load (None = all). Listing only the columns you need, e.g.
+# ['id', 'platform', 'short_text'], cuts parse time and memory on wide
+# exports; other columns are then left out of the results CSV.
+CSV_COLUMNS = None
+
+# CSV reader
+# "pandas"  - pandas C parser with type inference (default)
+# "pyarrow" - Arrow's multi-threaded parser into Arrow-backed columns
+#             (requires: pip install pyarrow). Every column is kept as text
+#             exactly as written in the source file.
+CSV_READER = "pandas"
+# Bytes parsed per chunk by the pyarrow reader when streaming
+ARROW_BLOCK_SIZE = 1 << 20
+
+# CSV writer for the results file
+# "pandas"  - DataFrame.to_csv (default)
+# "pyarrow" - Arrow's C++ writer, much faster on large results (requires:
+#             pip install pyarrow). Text fields are quoted and booleans are
+#             written as true/false.
+CSV_WRITER = "pandas"
+
+# Parallel sentiment scoring (joblib if installed, else a process pool)
+# Worker processes: -1 = all cores, 1 = disabled
+PARALLEL_JOBS = -1
+# Distinct messages needed before worker processes are used
+PARALLEL_MIN_MESSAGES = 20_000
+
+# Rows read per chunk when streaming large CSVs (web app), and by
+# analyze_abuse for inputs larger than CHUNKED_ANALYSIS_THRESHOLD
+CSV_CHUNK_SIZE = 50_000
+# Input size (bytes) above which analyze_abuse reads and analyzes in chunks
+CHUNKED_ANALYSIS_THRESHOLD = 256 * 1024 * 1024
+
+# Maximum rows kept (random sample) for charts when streaming
+VISUALIZATION_SAMPLE_SIZE = 100_000
+
+# Hash algorithm: any hashlib name, or 'blake3' for a faster multi-threaded
+# hash of large files (requires: pip install blake3)
 HASH_ALGORITHM = 'sha256'
 
 # File chunk size for hashing (in bytes)
+# Only used for inputs that cannot be memory-mapped (pipes, devices) when
+# hashlib.file_digest is unavailable (before Python 3.11) or with blake3
 HASH_CHUNK_SIZE = 4096
 
 # ============================================================================
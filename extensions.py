@@ -0,0 +1,27 @@
+"""
+Shared Flask extensions for the Forensic Analysis Tool
+- `celery`: background task queue used by `app.py` to run analyses
+  outside the request handler
+
+Celery is optional. Background processing is enabled when the `celery`
+package is installed and CELERY_BROKER_URL is set; otherwise `celery` is
+None and the web app runs each analysis inside the request as before.
+
+Run a worker (with the same CELERY_BROKER_URL as the web app):
+    celery -A app.celery worker --concurrency=4
+"""
+
+import os
+
+try:
+    from celery import Celery
+except ImportError:
+    Celery = None
+
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL")
+CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+
+if Celery is not None and CELERY_BROKER_URL:
+    celery = Celery("forensic", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
+else:
+    celery = None
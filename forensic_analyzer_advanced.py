@@ -6,16 +6,53 @@ This version allows you to modify config.py without touching the main script
 """
 
 import os
+import re
 import sys
 import hashlib
+import logging
+import mmap
+import stat
 import csv
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Render straight to files; no GUI toolkit
 import matplotlib.pyplot as plt
 from textblob import TextBlob
 
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+except ImportError:
+    SentimentIntensityAnalyzer = None
+
+try:
+    from joblib import Parallel, delayed, effective_n_jobs
+except ImportError:
+    Parallel = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
 # Import configuration
 try:
     from config import *
@@ -41,18 +78,35 @@ def compute_hash(file_path, algorithm=HASH_ALGORITHM):
     
     Args:
         file_path (str): Path to the file to hash
-        algorithm (str): Hashing algorithm (from config)
+        algorithm (str): Hashing algorithm (from config); any hashlib name,
+            or "blake3" (requires the blake3 package)
     
     Returns:
         str: Hexadecimal hash value or None
     """
-    hash_obj = hashlib.new(algorithm)
-    
     try:
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+            if algorithm == "blake3":
+                # Multi-threaded tree hash over the mapped file
+                if blake3 is None:
+                    raise ImportError("algorithm 'blake3' requires the blake3 package")
+                hash_obj = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            elif hasattr(hashlib, "file_digest"):
+                # Python 3.11+: the read/update loop runs in C
+                return hashlib.file_digest(f, algorithm).hexdigest()
+            else:
+                hash_obj = hashlib.new(algorithm)
+            
+            info = os.fstat(f.fileno())
+            if stat.S_ISREG(info.st_mode):
+                if info.st_size > 0:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        hash_obj.update(mapped)
+            else:
+                # Pipes and devices cannot be mapped; read them in chunks
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hash_obj.update(chunk)
+            return hash_obj.hexdigest()
     except FileNotFoundError:
         if SHOW_WARNINGS:
             print(f"❌ Error: File not found - {file_path}")
@@ -63,21 +117,89 @@ def compute_hash(file_path, algorithm=HASH_ALGORITHM):
         return None
 
 
+def _get_integrity_logger():
+    """
+    Return the shared integrity logger, attaching its file handler once.
+    
+    The handler appends and never rotates: evidence-hash records must not be
+    deleted, and the web server and every worker process append to the same
+    file, which per-process rotation cannot coordinate.
+    """
+    logger = logging.getLogger("integrity")
+    if not logger.handlers:
+        handler = logging.FileHandler(HASHES_LOG, mode="a", encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+_integrity_logger = _get_integrity_logger()
+
+
 def log_file_integrity(file_path, hash_value):
-    """Log file integrity information."""
-    try:
-        with open(HASHES_LOG, "a") as f:
-            timestamp = datetime.now().isoformat() if LOG_TIMESTAMPS else ""
-            f.write(f"{timestamp} | {file_path} | {hash_value}\n")
-    except Exception as e:
-        if SHOW_WARNINGS:
-            print(f"⚠ Warning: Could not log integrity - {e}")
+    """Log file integrity information (the log file stays open between calls)."""
+    timestamp = datetime.now().isoformat() if LOG_TIMESTAMPS else ""
+    _integrity_logger.info("%s | %s | %s", timestamp, file_path, hash_value)
 
 
 # ============================================================================
 # ANALYSIS FUNCTIONS
 # ============================================================================
 
+def compile_keywords(keyword_set):
+    """
+    Compile a keyword set into a single alternation regex.
+    
+    Keywords are lowercased and the pattern is case-sensitive, so it must be
+    run against lowercased text; that skips case-folding inside the scan.
+    
+    Args:
+        keyword_set (set): Keywords to match as substrings
+    
+    Returns:
+        re.Pattern: Compiled pattern matching any of the keywords
+    """
+    if not keyword_set:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(re.escape(keyword.lower()) for keyword in sorted(keyword_set)))
+
+
+def build_automaton(keyword_set):
+    """
+    Build an Aho-Corasick automaton for a keyword set.
+    
+    Like compile_keywords, keywords are lowercased and the automaton must be
+    run against lowercased text. It matches all keywords in one pass per
+    message, which beats the regex alternation for single-message checks.
+    
+    Args:
+        keyword_set (set): Keywords to match as substrings
+    
+    Returns:
+        ahocorasick.Automaton: Automaton, or None if pyahocorasick is not
+        installed or the set is empty
+    """
+    if ahocorasick is None or not keyword_set:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keyword_set:
+        automaton.add_word(keyword.lower(), keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_ABUSE_RE = compile_keywords(ABUSIVE_KEYWORDS)
+
+# Custom keyword sets passed to contains_abuse, compiled once per distinct set
+_compile_keyword_set = lru_cache(maxsize=32)(compile_keywords)
+_ABUSE_AUTOMATON = build_automaton(ABUSIVE_KEYWORDS)
+
+# Patterns for every preset, compiled once at import rather than per analysis
+KEYWORD_PATTERNS = {name: compile_keywords(keywords) for name, keywords in KEYWORD_SETS.items()}
+
+
 def contains_abuse(text, keyword_set=None):
     """
     Check if text contains abusive keywords.
@@ -92,19 +214,42 @@ def contains_abuse(text, keyword_set=None):
     if not isinstance(text, str):
         return False
     
-    if keyword_set is None:
-        keyword_set = ABUSIVE_KEYWORDS
+    if keyword_set is None and _ABUSE_AUTOMATON is not None:
+        return next(_ABUSE_AUTOMATON.iter(text.lower()), None) is not None
+    
+    pattern = _ABUSE_RE if keyword_set is None else _compile_keyword_set(frozenset(keyword_set))
+    return pattern.search(text.lower()) is not None
+
+
+_vader_analyzer = None
+
+
+def get_vader_analyzer():
+    """Return the shared VADER analyzer, creating it on first use."""
+    global _vader_analyzer
+    if _vader_analyzer is None:
+        _vader_analyzer = SentimentIntensityAnalyzer()
+    return _vader_analyzer
+
+
+@lru_cache(maxsize=SENTIMENT_CACHE_SIZE)
+def _cached_sentiment(text, backend):
+    """Score one non-empty text, memoized across chunks and requests."""
+    if backend == "vader":
+        scores = get_vader_analyzer().polarity_scores(text)
+        return scores["compound"], 1.0 - scores["neu"]
     
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in keyword_set)
+    sentiment = TextBlob(text).sentiment
+    return sentiment.polarity, sentiment.subjectivity
 
 
-def analyze_sentiment(text):
+def analyze_sentiment(text, backend=None):
     """
-    Perform sentiment analysis using TextBlob.
+    Perform sentiment analysis using the configured SENTIMENT_BACKEND.
     
     Args:
         text (str): Text to analyze
+        backend (str): Sentiment backend (defaults to SENTIMENT_BACKEND)
     
     Returns:
         tuple: (polarity, subjectivity)
@@ -113,14 +258,87 @@ def analyze_sentiment(text):
         return 0.0, 0.0
     
     try:
-        blob = TextBlob(text)
-        return blob.sentiment.polarity, blob.sentiment.subjectivity
+        return _cached_sentiment(text, backend or SENTIMENT_BACKEND)
     except Exception as e:
         if SHOW_WARNINGS:
             print(f"⚠ Warning: Sentiment analysis failed - {e}")
         return 0.0, 0.0
 
 
+# Load the sentiment lexicon once at import instead of on the first request
+if SENTIMENT_BACKEND != "vader" or SentimentIntensityAnalyzer is not None:
+    analyze_sentiment("warm up")
+
+
+def _score_batch(texts, backend):
+    """
+    Score a batch of texts (top-level so worker processes can unpickle it).
+    
+    Returns an (n, 2) float array rather than a list of tuples, so worker
+    results cross the process boundary as one compact buffer.
+    """
+    scores = [analyze_sentiment(text, backend) for text in texts]
+    return np.array(scores, dtype=float).reshape(-1, 2)
+
+
+def _parallel_workers():
+    """Number of worker processes PARALLEL_JOBS resolves to (joblib's rules)."""
+    if Parallel is not None:
+        return effective_n_jobs(PARALLEL_JOBS)
+    if PARALLEL_JOBS < 0:
+        return max((os.cpu_count() or 1) + 1 + PARALLEL_JOBS, 1)
+    return PARALLEL_JOBS
+
+
+def score_texts(texts):
+    """
+    Sentiment-score an array of texts.
+    
+    Inputs of at least PARALLEL_MIN_MESSAGES texts are split into one batch
+    per worker and scored in PARALLEL_JOBS processes, with joblib when it is
+    installed and a standard-library process pool otherwise; smaller inputs
+    are scored inline, where process start-up would cost more than it saves.
+    
+    Args:
+        texts (np.ndarray): Texts to analyze
+    
+    Returns:
+        np.ndarray: (n, 2) array of polarity and subjectivity, in input order
+    """
+    workers = _parallel_workers()
+    if workers <= 1 or len(texts) < PARALLEL_MIN_MESSAGES:
+        return _score_batch(texts, SENTIMENT_BACKEND)
+    
+    batches = np.array_split(texts, workers)
+    if Parallel is not None:
+        results = Parallel(n_jobs=workers, backend="loky")(
+            delayed(_score_batch)(batch, SENTIMENT_BACKEND) for batch in batches
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_score_batch, batches, repeat(SENTIMENT_BACKEND)))
+    return np.concatenate(results)
+
+
+SENTIMENT_CLASSES = ["Negative", "Neutral", "Positive"]
+
+
+def count_sentiment_classes(sentiment_class):
+    """
+    Count messages per sentiment class with np.bincount on categorical codes.
+    
+    Args:
+        sentiment_class (pd.Series): Sentiment class labels
+    
+    Returns:
+        dict: Non-zero counts, most common first (as value_counts orders them)
+    """
+    codes = pd.Categorical(sentiment_class, categories=SENTIMENT_CLASSES).codes
+    counts = np.bincount(codes[codes >= 0], minlength=len(SENTIMENT_CLASSES))
+    order = np.argsort(-counts, kind="stable")
+    return {SENTIMENT_CLASSES[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+
 def classify_sentiment(polarity):
     """Classify sentiment based on polarity score."""
     if polarity < NEGATIVE_THRESHOLD:
@@ -131,6 +349,131 @@ def classify_sentiment(polarity):
         return "Neutral"
 
 
+def classify_sentiments(polarity):
+    """
+    Vectorized classify_sentiment over an array of polarity scores.
+    
+    Args:
+        polarity (np.ndarray): Sentiment polarities
+    
+    Returns:
+        pd.Categorical: Sentiment classes over SENTIMENT_CLASSES
+    """
+    # Start at Neutral (1) and step down/up across the thresholds, so NaN
+    # stays Neutral like classify_sentiment. (pd.cut would put the
+    # thresholds themselves in the wrong class.)
+    polarity = np.asarray(polarity, dtype=float)
+    codes = np.ones(len(polarity), dtype=np.int8)
+    codes -= polarity < NEGATIVE_THRESHOLD
+    codes += polarity > POSITIVE_THRESHOLD
+    return pd.Categorical.from_codes(codes, categories=SENTIMENT_CLASSES)
+
+
+def _arrow_read_options(input_file):
+    """Arrow CSV options that keep every column as text, as written in the file."""
+    with open(input_file, newline="", encoding=CSV_ENCODING) as f:
+        header = next(csv.reader(f), [])
+    read_options = pacsv.ReadOptions(encoding=CSV_ENCODING, block_size=ARROW_BLOCK_SIZE)
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        strings_can_be_null=True,
+        include_columns=CSV_COLUMNS or [],
+    )
+    return read_options, convert_options
+
+
+def _use_arrow_reader():
+    """Whether CSV_READER selects pyarrow and pyarrow is installed."""
+    if CSV_READER != "pyarrow":
+        return False
+    if pa is None:
+        if SHOW_WARNINGS:
+            print("⚠ Warning: CSV_READER 'pyarrow' requires the pyarrow package; using pandas")
+        return False
+    return True
+
+
+def read_messages_csv(input_file):
+    """
+    Read a whole input CSV with the configured CSV_READER.
+    
+    The pyarrow reader parses multi-threaded into Arrow-backed columns and
+    declares every column as a string, so values (ids, timestamps, flags)
+    are kept exactly as written rather than re-inferred.
+    
+    Args:
+        input_file (str): Path to input CSV file
+    
+    Returns:
+        pd.DataFrame: Raw input data
+    """
+    if not _use_arrow_reader():
+        return pd.read_csv(input_file, encoding=CSV_ENCODING, usecols=CSV_COLUMNS)
+    
+    read_options, convert_options = _arrow_read_options(input_file)
+    table = pacsv.read_csv(input_file, read_options=read_options, convert_options=convert_options)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def iter_messages_csv(input_file):
+    """
+    Read an input CSV in chunks with the configured CSV_READER.
+    
+    pandas yields CSV_CHUNK_SIZE rows at a time; pyarrow yields one chunk
+    per ARROW_BLOCK_SIZE bytes. Chunks carry a continuous row index.
+    
+    Args:
+        input_file (str): Path to input CSV file
+    
+    Yields:
+        pd.DataFrame: Consecutive chunks of raw input data
+    """
+    if not _use_arrow_reader():
+        yield from pd.read_csv(input_file, encoding=CSV_ENCODING, usecols=CSV_COLUMNS, chunksize=CSV_CHUNK_SIZE)
+        return
+    
+    read_options, convert_options = _arrow_read_options(input_file)
+    reader = pacsv.open_csv(input_file, read_options=read_options, convert_options=convert_options)
+    start = 0
+    for batch in reader:
+        chunk = batch.to_pandas(types_mapper=pd.ArrowDtype)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+    
+    # Header-only file: yield one empty chunk, as pandas does
+    if start == 0:
+        yield reader.schema.empty_table().to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _concat_chunks(chunks, text_columns, input_file):
+    """
+    Concatenate analyzed chunks with the column dtypes a whole-file read gives.
+    
+    pandas infers dtypes per chunk, so after concat a column can be object
+    where a single read would give text (e.g. one chunk's 'platform' is all
+    missing); infer_objects() restores those. Columns that were text in some
+    chunk but parsed as numbers in another are re-read as text, since a
+    whole-file read keeps such columns exactly as written.
+    
+    Args:
+        chunks (list): Analyzed chunks, in file order
+        text_columns (set): Input columns read as text in at least one chunk
+        input_file (str): Path to input CSV file
+    
+    Returns:
+        pd.DataFrame: The concatenated dataframe
+    """
+    df = pd.concat(chunks).infer_objects()
+    mixed = [col for col in df.columns
+             if col in text_columns and pd.api.types.infer_dtype(df[col], skipna=True) != "string"]
+    if mixed:
+        text = pd.read_csv(input_file, encoding=CSV_ENCODING, usecols=mixed, dtype=str)
+        for col in mixed:
+            df[col] = text[col].to_numpy()
+    return df
+
+
 def analyze_abuse(input_file, keyword_preset="general"):
     """
     Main analysis function to detect abusive messages and analyze sentiment.
@@ -142,11 +485,36 @@ def analyze_abuse(input_file, keyword_preset="general"):
     Returns:
         pd.DataFrame: Enhanced dataframe with analysis columns
     """
+    if SENTIMENT_BACKEND == "vader" and SentimentIntensityAnalyzer is None:
+        print("❌ Error: SENTIMENT_BACKEND 'vader' requires the vaderSentiment package")
+        return None
+    
+    # Get keyword pattern
+    pattern = KEYWORD_PATTERNS.get(keyword_preset, _ABUSE_RE)
+    
     if VERBOSE_OUTPUT:
         print(f"\n📂 Loading data from: {input_file}")
     
     try:
-        df = pd.read_csv(input_file, encoding=CSV_ENCODING)
+        # Large files are read and analyzed CSV_CHUNK_SIZE rows at a time, so
+        # parser buffers and per-message temporaries never span the whole file
+        if os.path.getsize(input_file) > CHUNKED_ANALYSIS_THRESHOLD:
+            if VERBOSE_OUTPUT:
+                print(f"\n🔍 Analyzing messages in chunks (using '{keyword_preset}' keyword set)...")
+            chunks = []
+            text_columns = set()
+            for chunk in iter_messages_csv(input_file):
+                if not chunks and not all(col in chunk.columns for col in CSV_REQUIRED_COLUMNS):
+                    print(f"❌ Error: CSV must contain columns: {CSV_REQUIRED_COLUMNS}")
+                    return None
+                text_columns.update(col for col in chunk.columns if pd.api.types.is_string_dtype(chunk[col]))
+                chunks.append(annotate_messages(chunk, pattern))
+            df = _concat_chunks(chunks, text_columns, input_file)
+            if VERBOSE_OUTPUT:
+                print(f"✓ Analyzed {len(df)} records")
+            return df
+        
+        df = read_messages_csv(input_file)
         if VERBOSE_OUTPUT:
             print(f"✓ Loaded {len(df)} records")
     except FileNotFoundError:
@@ -161,31 +529,145 @@ def analyze_abuse(input_file, keyword_preset="general"):
         print(f"❌ Error: CSV must contain columns: {CSV_REQUIRED_COLUMNS}")
         return None
     
-    # Get keyword set
-    keywords = KEYWORD_SETS.get(keyword_preset, ABUSIVE_KEYWORDS)
-    
     if VERBOSE_OUTPUT:
         print(f"\n🔍 Analyzing messages (using '{keyword_preset}' keyword set)...")
     
     # Perform analysis
-    df["is_abusive"] = df["short_text"].apply(lambda x: contains_abuse(x, keywords))
-    df["sentiment_polarity"], df["sentiment_subjectivity"] = zip(
-        *df["short_text"].apply(analyze_sentiment)
-    )
-    df["sentiment_class"] = df["sentiment_polarity"].apply(classify_sentiment)
+    return annotate_messages(df, pattern)
+
+
+def annotate_messages(df, pattern):
+    """
+    Add abuse and sentiment columns to a dataframe of messages (in place).
+    
+    Args:
+        df (pd.DataFrame): Dataframe with a 'short_text' column
+        pattern (re.Pattern): Compiled keyword pattern from compile_keywords
     
+    Returns:
+        pd.DataFrame: The same dataframe, with analysis columns added
+    """
+    # Analyze each distinct message once; duplicates (retweets, spam) reuse
+    # the result through their factorized code
+    codes, unique_texts = pd.factorize(df["short_text"].fillna("").to_numpy())
+    lowered = pd.Series(unique_texts, dtype=object).astype(str).str.lower()
+    df["is_abusive"] = lowered.str.contains(pattern).to_numpy(dtype=bool)[codes]
+    del lowered
+    scores = score_texts(unique_texts)[codes]
+    # Polarity stays float64: it is classified against the thresholds and
+    # printed in the report. Subjectivity is only averaged and charted, so it
+    # is stored as float32 (half the memory and I/O)
+    df["sentiment_polarity"] = scores[:, 0]
+    df["sentiment_subjectivity"] = scores[:, 1].astype(np.float32)
+    df["sentiment_class"] = classify_sentiments(scores[:, 0])
     return df
 
 
+def stream_analysis(input_file, output_file, keyword_preset="general"):
+    """
+    Analyze a CSV in CSV_CHUNK_SIZE pieces, appending results to `output_file`.
+    
+    Peak memory follows the chunk size rather than the file size: summary
+    statistics are kept as running totals, and only the first
+    MAX_DETAILED_FINDINGS rows (for the report) and a uniform random sample
+    of up to VISUALIZATION_SAMPLE_SIZE rows (for the charts) are retained.
+    
+    Args:
+        input_file (str): Path to input CSV file
+        output_file (str): Path of the results CSV to write
+        keyword_preset (str): Which keyword set to use from KEYWORD_SETS
+    
+    Returns:
+        tuple: (summary, findings_df, sample_df) or None on failure
+    """
+    if VERBOSE_OUTPUT:
+        print(f"\n📂 Streaming data from: {input_file}")
+    
+    if SENTIMENT_BACKEND == "vader" and SentimentIntensityAnalyzer is None:
+        print("❌ Error: SENTIMENT_BACKEND 'vader' requires the vaderSentiment package")
+        return None
+    
+    pattern = KEYWORD_PATTERNS.get(keyword_preset, _ABUSE_RE)
+    
+    if VERBOSE_OUTPUT:
+        print(f"\n🔍 Analyzing messages (using '{keyword_preset}' keyword set)...")
+    
+    total_messages = 0
+    abusive_count = 0
+    polarity_sum = 0.0
+    subjectivity_sum = 0.0
+    sentiment_counts = Counter()
+    findings = []
+    sample = None
+    rng = np.random.default_rng()
+    use_arrow = _use_arrow_writer()
+    
+    try:
+        reader = iter_messages_csv(input_file)
+        for chunk_number, chunk in enumerate(reader):
+            first_chunk = chunk_number == 0
+            if first_chunk and not all(col in chunk.columns for col in CSV_REQUIRED_COLUMNS):
+                print(f"❌ Error: CSV must contain columns: {CSV_REQUIRED_COLUMNS}")
+                return None
+            
+            annotate_messages(chunk, pattern)
+            write_results_csv(chunk, output_file, use_arrow, append=not first_chunk)
+            
+            total_messages += len(chunk)
+            abusive_count += int(np.count_nonzero(chunk["is_abusive"].to_numpy()))
+            polarity_sum += float(chunk["sentiment_polarity"].to_numpy().sum(dtype=np.float64))
+            subjectivity_sum += float(chunk["sentiment_subjectivity"].to_numpy().sum(dtype=np.float64))
+            sentiment_counts.update(count_sentiment_classes(chunk["sentiment_class"]))
+            
+            findings_needed = MAX_DETAILED_FINDINGS - sum(len(f) for f in findings)
+            if findings_needed > 0 or first_chunk:
+                findings.append(chunk.head(max(findings_needed, 0)))
+            
+            # Keep the rows with the smallest random keys: a uniform sample
+            keyed = chunk[["is_abusive", "sentiment_polarity", "sentiment_subjectivity", "sentiment_class"]]
+            keyed = keyed.assign(_sample_key=rng.random(len(chunk)))
+            sample = keyed if sample is None else pd.concat([sample, keyed])
+            if len(sample) > VISUALIZATION_SAMPLE_SIZE:
+                sample = sample.nsmallest(VISUALIZATION_SAMPLE_SIZE, "_sample_key")
+    except FileNotFoundError:
+        print(f"❌ Error: Input file not found - {input_file}")
+        return None
+    except Exception as e:
+        print(f"❌ Error reading CSV: {e}")
+        return None
+    
+    if VERBOSE_OUTPUT:
+        print(f"✓ Analyzed {total_messages} records")
+        print(f"✓ Results saved to: {output_file}")
+    
+    summary = {
+        "total_messages": total_messages,
+        "abusive_count": abusive_count,
+        "abusive_percentage": (abusive_count / total_messages * 100) if total_messages > 0 else 0,
+        "sentiment_counts": dict(sentiment_counts.most_common()),
+        "avg_polarity": polarity_sum / total_messages if total_messages > 0 else float("nan"),
+        "avg_subjectivity": subjectivity_sum / total_messages if total_messages > 0 else float("nan"),
+    }
+    findings_df = pd.concat(findings)
+    sample_df = sample.drop(columns="_sample_key").sort_index()
+    
+    return summary, findings_df, sample_df
+
+
 def generate_summary(df):
     """Generate comprehensive summary statistics."""
+    # Reduce the underlying arrays directly; float32 scores are accumulated
+    # in float64
     total_messages = len(df)
-    abusive_count = df["is_abusive"].sum()
+    abusive_count = int(np.count_nonzero(df["is_abusive"].to_numpy()))
     abusive_percentage = (abusive_count / total_messages * 100) if total_messages > 0 else 0
     
-    sentiment_counts = df["sentiment_class"].value_counts().to_dict()
-    avg_polarity = df["sentiment_polarity"].mean()
-    avg_subjectivity = df["sentiment_subjectivity"].mean()
+    sentiment_counts = count_sentiment_classes(df["sentiment_class"])
+    if total_messages > 0:
+        scores = df[["sentiment_polarity", "sentiment_subjectivity"]].to_numpy()
+        avg_polarity, avg_subjectivity = scores.mean(axis=0, dtype=np.float64)
+    else:
+        avg_polarity = avg_subjectivity = float("nan")
     
     return {
         "total_messages": total_messages,
@@ -221,10 +703,40 @@ def print_summary(summary, input_file, file_hash):
 # OUTPUT & REPORTING FUNCTIONS
 # ============================================================================
 
+def _use_arrow_writer():
+    """Whether CSV_WRITER selects pyarrow and pyarrow is installed."""
+    if CSV_WRITER != "pyarrow":
+        return False
+    if pa is None:
+        if SHOW_WARNINGS:
+            print("⚠ Warning: CSV_WRITER 'pyarrow' requires the pyarrow package; using pandas")
+        return False
+    return True
+
+
+def write_results_csv(df, output_file, use_arrow, append=False):
+    """
+    Write analyzed rows to CSV, or append them without a header.
+    
+    Args:
+        df (pd.DataFrame): Analyzed dataframe
+        output_file (str): Path of the results CSV
+        use_arrow (bool): Write with pyarrow's C++ writer instead of pandas
+        append (bool): Append to an existing results CSV
+    """
+    if not use_arrow:
+        df.to_csv(output_file, mode="a" if append else "w", header=not append, index=False)
+        return
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with open(output_file, "ab" if append else "wb") as f:
+        pacsv.write_csv(table, f, pacsv.WriteOptions(include_header=not append))
+
+
 def save_results_csv(df, output_file):
     """Save analysis results to CSV."""
     try:
-        df.to_csv(output_file, index=False)
+        write_results_csv(df, output_file, _use_arrow_writer())
         if VERBOSE_OUTPUT:
             print(f"✓ Results saved to: {output_file}")
         return True
@@ -233,55 +745,82 @@ def save_results_csv(df, output_file):
         return False
 
 
+def _report_text(values):
+    """str() each value, writing missing values as 'nan' for every CSV_READER."""
+    # Arrow-backed columns would otherwise print nulls as '<NA>'
+    return np.where(values.isna(), "nan", values.map(str))
+
+
+def format_findings(df):
+    """
+    Format the [DETAILED FINDINGS] table rows for the forensic report.
+    
+    Each column is converted once and the rows are joined into a single
+    string, instead of materializing a Series per row with iterrows.
+    
+    Returns:
+        str: One line per record, each ending in a newline
+    """
+    record_ids = _report_text(df['id']) if 'id' in df.columns else df.index.map(str)
+    platforms = _report_text(df['platform']) if 'platform' in df.columns else repeat('N/A')
+    is_abusive = np.where(df['is_abusive'], "YES", "NO")
+    
+    return "".join(
+        f"{record_id:<10.10} {platform:<15.15} {abusive:<10} {polarity:<12.4f} {sentiment:<12}\n"
+        for record_id, platform, abusive, polarity, sentiment in zip(
+            record_ids, platforms, is_abusive, df['sentiment_polarity'], df['sentiment_class']
+        )
+    )
+
+
 def save_forensic_report(df, summary, input_file, file_hash, output_file):
     """Save detailed forensic report as text file."""
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("="*80 + "\n")
-            f.write("DIGITAL FORENSIC ANALYSIS REPORT - ONLINE ABUSE DETECTION\n")
-            f.write("="*80 + "\n\n")
-            
-            f.write("[EVIDENCE INFORMATION]\n")
-            f.write(f"Source File: {input_file}\n")
-            f.write(f"{HASH_ALGORITHM.upper()} Hash: {file_hash}\n")
-            f.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
-            f.write(f"Total Records: {summary['total_messages']}\n\n")
-            
-            f.write("[ABUSE DETECTION RESULTS]\n")
-            f.write(f"Abusive Messages Found: {summary['abusive_count']}\n")
-            f.write(f"Abuse Percentage: {summary['abusive_percentage']:.2f}%\n")
-            f.write(f"Abusive Keywords Used: {', '.join(sorted(ABUSIVE_KEYWORDS))}\n\n")
-            
-            f.write("[SENTIMENT ANALYSIS]\n")
-            f.write(f"Average Polarity: {summary['avg_polarity']:.4f}\n")
-            f.write(f"Average Subjectivity: {summary['avg_subjectivity']:.4f}\n")
-            f.write("Sentiment Distribution:\n")
-            for sentiment, count in summary['sentiment_counts'].items():
-                percentage = (count / summary['total_messages'] * 100) if summary['total_messages'] > 0 else 0
-                f.write(f"  {sentiment}: {count} ({percentage:.2f}%)\n")
-            f.write("\n")
+        lines = []
+        lines.append("="*80 + "\n")
+        lines.append("DIGITAL FORENSIC ANALYSIS REPORT - ONLINE ABUSE DETECTION\n")
+        lines.append("="*80 + "\n\n")
+        
+        lines.append("[EVIDENCE INFORMATION]\n")
+        lines.append(f"Source File: {input_file}\n")
+        lines.append(f"{HASH_ALGORITHM.upper()} Hash: {file_hash}\n")
+        lines.append(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+        lines.append(f"Total Records: {summary['total_messages']}\n\n")
+        
+        lines.append("[ABUSE DETECTION RESULTS]\n")
+        lines.append(f"Abusive Messages Found: {summary['abusive_count']}\n")
+        lines.append(f"Abuse Percentage: {summary['abusive_percentage']:.2f}%\n")
+        lines.append(f"Abusive Keywords Used: {', '.join(sorted(ABUSIVE_KEYWORDS))}\n\n")
+        
+        lines.append("[SENTIMENT ANALYSIS]\n")
+        lines.append(f"Average Polarity: {summary['avg_polarity']:.4f}\n")
+        lines.append(f"Average Subjectivity: {summary['avg_subjectivity']:.4f}\n")
+        lines.append("Sentiment Distribution:\n")
+        for sentiment, count in summary['sentiment_counts'].items():
+            percentage = (count / summary['total_messages'] * 100) if summary['total_messages'] > 0 else 0
+            lines.append(f"  {sentiment}: {count} ({percentage:.2f}%)\n")
+        lines.append("\n")
+        
+        if INCLUDE_DETAILED_FINDINGS:
+            lines.append("[DETAILED FINDINGS]\n")
+            lines.append(f"{'ID':<10} {'Platform':<15} {'Abusive':<10} {'Polarity':<12} {'Sentiment':<12}\n")
+            lines.append("-"*80 + "\n")
             
-            if INCLUDE_DETAILED_FINDINGS:
-                f.write("[DETAILED FINDINGS]\n")
-                f.write(f"{'ID':<10} {'Platform':<15} {'Abusive':<10} {'Polarity':<12} {'Sentiment':<12}\n")
-                f.write("-"*80 + "\n")
-                
-                for idx, row in df.iterrows():
-                    if idx >= MAX_DETAILED_FINDINGS:
-                        f.write(f"... ({len(df) - idx} more records)\n")
-                        break
-                    
-                    record_id = str(row.get('id', idx))[:10]
-                    platform = str(row.get('platform', 'N/A'))[:15]
-                    is_abusive = "YES" if row['is_abusive'] else "NO"
-                    polarity = f"{row['sentiment_polarity']:.4f}"
-                    sentiment = row['sentiment_class']
-                    
-                    f.write(f"{record_id:<10} {platform:<15} {is_abusive:<10} {polarity:<12} {sentiment:<12}\n")
+            shown = df.head(MAX_DETAILED_FINDINGS)
+            lines.append(format_findings(shown))
             
-            f.write("\n" + "="*80 + "\n")
-            f.write("END OF REPORT\n")
-            f.write("="*80 + "\n")
+            # df may hold only the leading rows (see stream_analysis)
+            remaining = summary['total_messages'] - len(shown)
+            if remaining > 0:
+                lines.append(f"... ({remaining} more records)\n")
+        
+        lines.append("\n" + "="*80 + "\n")
+        lines.append("END OF REPORT\n")
+        lines.append("="*80 + "\n")
+        
+        # One buffered write instead of one call per line
+        with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write("".join(lines))
         
         if VERBOSE_OUTPUT:
             print(f"✓ Forensic report saved to: {output_file}")
@@ -295,14 +834,23 @@ def save_forensic_report(df, summary, input_file, file_hash, output_file):
 # VISUALIZATION FUNCTIONS
 # ============================================================================
 
-def visualize_sentiment(df, output_file):
-    """Generate visualization of sentiment polarity distribution."""
+def visualize_sentiment(df, output_file, summary=None):
+    """
+    Generate visualization of sentiment polarity distribution.
+    
+    When `summary` is given (e.g. `df` is only a sample from stream_analysis),
+    class counts, abuse counts and means are taken from it instead of `df`.
+    """
     try:
-        fig, axes = plt.subplots(2, 2, figsize=VISUALIZATION_SIZE, dpi=VISUALIZATION_DPI)
+        # Lay out at screen resolution; VISUALIZATION_DPI only sets the saved image
+        fig, axes = plt.subplots(2, 2, figsize=VISUALIZATION_SIZE, dpi=100, constrained_layout=True)
         fig.suptitle("Sentiment Analysis Visualization - Forensic Report", fontsize=16, fontweight='bold')
         
         # 1. Sentiment Class Distribution
-        sentiment_counts = df['sentiment_class'].value_counts()
+        if summary is not None:
+            sentiment_counts = pd.Series(summary['sentiment_counts'])
+        else:
+            sentiment_counts = pd.Series(count_sentiment_classes(df['sentiment_class']))
         colors = [COLOR_NEGATIVE, COLOR_NEUTRAL, COLOR_POSITIVE]
         axes[0, 0].pie(
             sentiment_counts.values,
@@ -314,9 +862,12 @@ def visualize_sentiment(df, output_file):
         axes[0, 0].set_title("Sentiment Class Distribution", fontweight='bold')
         
         # 2. Abusive vs Non-Abusive
-        abuse_counts = df['is_abusive'].value_counts()
         abuse_labels = ['Non-Abusive', 'Abusive']
-        abuse_values = [abuse_counts.get(False, 0), abuse_counts.get(True, 0)]
+        if summary is not None:
+            abuse_values = [summary['total_messages'] - summary['abusive_count'], summary['abusive_count']]
+        else:
+            abuse_counts = np.bincount(df['is_abusive'].to_numpy(dtype=np.uint8), minlength=2)
+            abuse_values = [int(abuse_counts[0]), int(abuse_counts[1])]
         axes[0, 1].bar(abuse_labels, abuse_values, color=[COLOR_SAFE, COLOR_ABUSIVE])
         axes[0, 1].set_title("Abuse Detection Results", fontweight='bold')
         axes[0, 1].set_ylabel("Count")
@@ -324,26 +875,29 @@ def visualize_sentiment(df, output_file):
             axes[0, 1].text(i, v + 0.5, str(v), ha='center', fontweight='bold')
         
         # 3. Polarity Distribution
-        axes[1, 0].hist(df['sentiment_polarity'], bins=30, color='#3498db', edgecolor='black', alpha=0.7)
+        polarity_counts, polarity_edges = np.histogram(df['sentiment_polarity'].to_numpy(), bins=30)
+        axes[1, 0].bar(polarity_edges[:-1], polarity_counts, width=np.diff(polarity_edges), align='edge',
+                       color='#3498db', edgecolor='black', alpha=0.7)
         axes[1, 0].set_title("Sentiment Polarity Distribution", fontweight='bold')
         axes[1, 0].set_xlabel("Polarity Score")
         axes[1, 0].set_ylabel("Frequency")
-        mean_polarity = df['sentiment_polarity'].mean()
+        mean_polarity = summary['avg_polarity'] if summary is not None else df['sentiment_polarity'].mean()
         axes[1, 0].axvline(mean_polarity, color='red', linestyle='--', linewidth=2, 
                           label=f"Mean: {mean_polarity:.3f}")
         axes[1, 0].legend()
         
         # 4. Subjectivity Distribution
-        axes[1, 1].hist(df['sentiment_subjectivity'], bins=30, color='#f39c12', edgecolor='black', alpha=0.7)
+        subjectivity_counts, subjectivity_edges = np.histogram(df['sentiment_subjectivity'].to_numpy(), bins=30)
+        axes[1, 1].bar(subjectivity_edges[:-1], subjectivity_counts, width=np.diff(subjectivity_edges), align='edge',
+                       color='#f39c12', edgecolor='black', alpha=0.7)
         axes[1, 1].set_title("Sentiment Subjectivity Distribution", fontweight='bold')
         axes[1, 1].set_xlabel("Subjectivity Score")
         axes[1, 1].set_ylabel("Frequency")
-        mean_subjectivity = df['sentiment_subjectivity'].mean()
+        mean_subjectivity = summary['avg_subjectivity'] if summary is not None else df['sentiment_subjectivity'].mean()
         axes[1, 1].axvline(mean_subjectivity, color='red', linestyle='--', linewidth=2,
                           label=f"Mean: {mean_subjectivity:.3f}")
         axes[1, 1].legend()
         
-        plt.tight_layout()
         plt.savefig(output_file, dpi=VISUALIZATION_DPI, bbox_inches='tight')
         if VERBOSE_OUTPUT:
             print(f"✓ Visualization saved to: {output_file}")
@@ -400,7 +954,7 @@ def main(input_file="incident_log.csv", keyword_preset="general"):
     # Step 6: Save results
     save_results_csv(df, RESULTS_CSV)
     save_forensic_report(df, summary, input_file, file_hash, REPORT_TXT)
-    visualize_sentiment(df, VISUALIZATION)
+    visualize_sentiment(df, VISUALIZATION, summary)
     
     print("\n" + "✅ "*20)
     print("ANALYSIS COMPLETE")
@@ -413,6 +967,10 @@ def main(input_file="incident_log.csv", keyword_preset="general"):
 
 
 if __name__ == "__main__":
+    # Run through the imported module rather than __main__, so joblib workers
+    # unpickle _score_batch (and the sentiment cache it uses) by reference
+    import forensic_analyzer_advanced
+    
     keyword_set = "general"  # Change to 'harassment', 'cyberbullying', or 'combined'
     
     if len(sys.argv) > 1:
@@ -423,4 +981,4 @@ if __name__ == "__main__":
     if len(sys.argv) > 2:
         keyword_set = sys.argv[2]
     
-    main(input_file, keyword_set)
+    forensic_analyzer_advanced.main(input_file, keyword_set)